@@ -1,30 +1,78 @@
 import os
-import json
+import sys
+import logging
+import asyncio
+import uuid
+import importlib.util
 import contextlib
 from contextlib import AsyncExitStack
+from datetime import timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+
+from llm_cache import LLMCache
+from session_store import SessionStore
+from jobs import Job, JobRegistry
+from router import ToolRouter
 
 load_dotenv()
 
+log = logging.getLogger("cassandra.chat")
+
 # --- OpenAI (new SDK preferred; fallback to legacy) ---
 USE_NEW_OPENAI = False
 try:
-    from openai import OpenAI
-    oai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    import httpx
+    from openai import AsyncOpenAI
+    # One long-lived pooled client so requests reuse connections; HTTP/2 when h2 is installed.
+    oai_http = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        http2=importlib.util.find_spec("h2") is not None,
+    )
+    oai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=oai_http)
     USE_NEW_OPENAI = True
 except Exception:
     import openai
     openai.api_key = os.getenv("OPENAI_API_KEY")
 
+# Resolve the SDK differences once here so the request path has no branches.
+if USE_NEW_OPENAI:
+    async def open_completion_stream(**kwargs: Any) -> AsyncIterator[Any]:
+        return await oai_client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **kwargs)
+
+    def chunk_to_dict(chunk: Any) -> Dict[str, Any]:
+        return chunk.model_dump()
+else:
+    async def open_completion_stream(**kwargs: Any) -> AsyncIterator[Any]:
+        return await openai.ChatCompletion.acreate(stream=True, **kwargs)
+
+    def chunk_to_dict(chunk: Any) -> Dict[str, Any]:
+        return chunk  # legacy OpenAIObject is already a dict
+
 # --- MCP client(s) ---
 # pip install "mcp>=1.9"
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+import anyio
+
+# Codes the MCP client uses for requests cut off by a closed connection, and for
+# requests that got no response within read_timeout_seconds (a half-dead stream).
+MCP_CONNECTION_CLOSED = -32000
+MCP_REQUEST_TIMEOUT = 408
+MCP_TRANSPORT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, ConnectionError)
+
+def is_mcp_transport_error(e: BaseException) -> bool:
+    """True when `e` means the MCP connection itself is gone, not that one call failed."""
+    if isinstance(e, McpError):
+        return getattr(getattr(e, "error", None), "code", None) in (MCP_CONNECTION_CLOSED, MCP_REQUEST_TIMEOUT)
+    return isinstance(e, MCP_TRANSPORT_ERRORS)
 
 # SSE client (connects to server already running over HTTP/SSE)
 try:
@@ -33,13 +81,45 @@ try:
 except Exception:
     HAS_SSE = False
 
+# Optional: compiles tool schemas into validators at startup (pip install fastjsonschema)
+try:
+    import fastjsonschema
+    HAS_FASTJSONSCHEMA = True
+except Exception:
+    HAS_FASTJSONSCHEMA = False
+
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.2"))
+# Embedding router: answer clearly-targeted requests by calling the tool directly,
+# skipping the tool-selection LLM round. Requires the new OpenAI SDK.
+ROUTER_ENABLED = os.getenv("ROUTER_ENABLED", "0") == "1"
+ROUTER_THRESHOLD = float(os.getenv("ROUTER_THRESHOLD", "0.85"))
+# Only read-only tools may be routed to; anything disruptive must go through the model
+# so it can warn first. restart_node is excluded even if listed.
+ROUTER_TOOLS = {
+    name.strip()
+    for name in os.getenv("ROUTER_TOOLS", "list_clusters,cluster_overview,node_health,query_metrics,fetch_logs").split(",")
+    if name.strip()
+} - {"restart_node"}
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+ROUTER_CACHE_PATH = Path(os.getenv("ROUTER_CACHE_PATH", str(Path(__file__).with_name(".router_embeddings.json"))))
+# Messages sent to one session within this window are answered together (0 disables).
+CHAT_DEBOUNCE_MS = int(os.getenv("CHAT_DEBOUNCE_MS", "0"))
+
+# Identical (model, messages, tools, temperature) requests are answered from memory.
+llm_cache = LLMCache(
+    maxsize=int(os.getenv("LLM_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("LLM_CACHE_TTL", "3600")),
+)
 
 # If MCP_URL is set, we use SSE (network). Otherwise we fall back to STDIO (spawn).
 MCP_URL = os.getenv("MCP_URL", "").strip()
 PYTHON_BIN = os.getenv("PYTHON_BIN", "python")
 MCP_ENTRY  = os.getenv("MCP_ENTRY", "server.py")
 MCP_COMMAND = [PYTHON_BIN, MCP_ENTRY]
+# The MCP session is shared by every request, so a call that never gets a response
+# must fail (and trigger a reconnect) rather than stall every /chat behind it.
+MCP_TIMEOUT = timedelta(seconds=float(os.getenv("MCP_TIMEOUT", "30")))
 
 BASE_SYSTEM_PROMPT = """You are Cassandra Doctor — an expert SRE/DBA assistant for Apache Cassandra clusters.
 
@@ -50,87 +130,85 @@ ALWAYS call the appropriate tool(s) first before providing an answer. If you don
 Be concise and specific. Warn before any disruptive actions. Return clear steps and brief rationale.
 """
 
-app = FastAPI()
-SESSIONS: Dict[str, List[Dict[str, Any]]] = {}
-
-def build_dynamic_system_prompt(mcp_tools: List[Any], mcp_resources: List[Any]) -> str:
-    """Build a dynamic system prompt that includes discovered tools and resources."""
-    prompt = BASE_SYSTEM_PROMPT + "\n\n"
-    
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Conversation history per session; set REDIS_URL to share it across workers.
+session_store = SessionStore(
+    redis_url=os.getenv("REDIS_URL", "").strip() or None,
+    maxsize=int(os.getenv("SESSION_CACHE_SIZE", "1000")),
+    ttl=int(os.getenv("SESSION_TTL", "7200")),
+)
+# Sessions are periodically trimmed to their most recent messages.
+SESSION_MAX_MESSAGES = int(os.getenv("SESSION_MAX_MESSAGES", "40"))
+SESSION_TRIM_INTERVAL = float(os.getenv("SESSION_TRIM_INTERVAL", "60"))
+# Chat runs keyed by job id; finished jobs stay pollable for JOB_TTL seconds.
+jobs = JobRegistry(ttl=float(os.getenv("JOB_TTL", "600")))
+
+# One MCP session per process, opened at startup and reused by every /chat request.
+app.state.mcp_session = None
+app.state.mcp_stop = None
+app.state.mcp_task = None
+app.state.mcp_tools_cache = []
+app.state.oai_tools = ()
+app.state.tool_names = []
+app.state.dispatch = {}
+app.state.system_messages = []
+app.state.router = None
+
+# Per-session message batching: the open batch (if any) and a lock serializing runs.
+app.state.pending_chats = {}
+app.state.buf_locks = {}
+app.state.mcp_lock = asyncio.Lock()
+
+def build_dynamic_system_prompt(mcp_tools: List[Any], mcp_resources: List[Any]) -> List[Dict[str, Any]]:
+    """Build the system messages that include discovered tools and resources.
+
+    Returns [static prefix, session hints]. Called once per MCP connection; the
+    result is kept in app.state.system_messages and reused verbatim on every
+    request so the serialized prompt prefix stays byte-identical.
+    """
+    # Static prefix: base prompt + tool catalog. Identical across requests, so it
+    # forms the long stable prefix OpenAI's prompt caching keys on.
+    prefix = BASE_SYSTEM_PROMPT + "\n\n"
     if mcp_tools:
-        prompt += "AVAILABLE TOOLS:\n"
+        prefix += "AVAILABLE TOOLS:\n"
         for tool in mcp_tools:
-            prompt += f"- {tool.name}: {tool.description or 'No description'}\n"
-            
-            # Check for different possible schema attributes
-            schema = None
-            if hasattr(tool, 'input_schema') and tool.input_schema:
-                schema = tool.input_schema
-            elif hasattr(tool, 'inputSchema') and tool.inputSchema:
-                schema = tool.inputSchema
-            elif hasattr(tool, 'parameters') and tool.parameters:
-                schema = tool.parameters
-            elif hasattr(tool, 'args') and tool.args:
-                schema = tool.args
-            
-            if schema:
-                prompt += f"  Parameters: {json.dumps(schema, indent=2)}\n"
-            else:
-                # Debug: show what attributes the tool actually has
-                prompt += f"  Available attributes: {[attr for attr in dir(tool) if not attr.startswith('_')]}\n"
-        prompt += "\n"
+            prefix += f"- {tool.name}: {tool.description or 'No description'}\n"
+            prefix += f"  Parameters: {orjson.dumps(tool_schema(tool), option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()}\n"
     
+    # Short session hints go in a separate message after the prefix.
+    hints = ""
     if mcp_resources:
-        prompt += "AVAILABLE RESOURCES:\n"
-        for resource in mcp_resources:
-            prompt += f"- {resource.uri}: {resource.description or 'No description'}\n"
-        prompt += "\n"
-    
-    prompt += "Use the tools and resources above to answer questions. Always call the appropriate tool first to get data before responding."
-    
-    return prompt
-
-def build_messages(session_id: str, mcp_tools: List[Any] = None, mcp_resources: List[Any] = None, force_refresh: bool = False) -> List[Dict[str, Any]]:
-    msgs = SESSIONS.setdefault(session_id, [])
-    
-    # Build dynamic system prompt if tools/resources are provided
-    if mcp_tools is not None or mcp_resources is not None:
-        system_prompt = build_dynamic_system_prompt(mcp_tools or [], mcp_resources or [])
-        
-        # Check if we need to update the system prompt
-        current_system = msgs[0] if msgs and msgs[0].get("role") == "system" else None
-        should_update = force_refresh or not current_system or current_system["content"] != system_prompt
-        
-        if should_update:
-            if current_system:
-                # Update existing system message
-                msgs[0]["content"] = system_prompt
-                print(f"Updated system prompt for session {session_id}")
-            else:
-                # Insert new system message
-                msgs.insert(0, {"role": "system", "content": system_prompt})
-                print(f"Created new system prompt for session {session_id}")
-    elif not msgs or msgs[0].get("role") != "system":
-        # Fallback to base prompt if no tools/resources provided
-        msgs.insert(0, {"role": "system", "content": BASE_SYSTEM_PROMPT})
-    
-    return msgs
+        hints += "AVAILABLE RESOURCES:\n"
+        for r in mcp_resources:
+            hints += f"- {r.uri}: {r.description or 'No description'}\n"
+        hints += "\n"
+    hints += "Use the tools and resources above to answer questions. Always call the appropriate tool first to get data before responding."
+
+    return [{"role": "system", "content": prefix}, {"role": "system", "content": hints}]
+
+def build_messages(history: List[Dict[str, Any]], system_messages: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Return system messages followed by the session history; user text goes last."""
+    if not system_messages:
+        # Fallback to base prompt if no tools/resources were discovered
+        system_messages = [{"role": "system", "content": BASE_SYSTEM_PROMPT}]
+    return [*system_messages, *history]
+
+def sort_keys(obj: Any) -> Any:
+    """Recursively rebuild dicts with sorted keys so serialized schemas are byte-stable."""
+    if isinstance(obj, dict):
+        return {k: sort_keys(obj[k]) for k in sorted(obj)}
+    if isinstance(obj, list):
+        return [sort_keys(v) for v in obj]
+    return obj
+
+def tool_schema(mcp_tool: Any) -> Dict[str, Any]:
+    """The tool's JSON schema, whichever attribute the MCP SDK version exposes it under."""
+    return (getattr(mcp_tool, "inputSchema", None) or getattr(mcp_tool, "input_schema", None)
+            or getattr(mcp_tool, "parameters", None) or {"type": "object", "properties": {}})
 
 def to_openai_tool(mcp_tool: Any) -> Dict[str, Any]:
-    # Check for different possible schema attributes
-    schema = None
-    if hasattr(mcp_tool, 'input_schema') and mcp_tool.input_schema:
-        schema = mcp_tool.input_schema
-    elif hasattr(mcp_tool, 'inputSchema') and mcp_tool.inputSchema:
-        schema = mcp_tool.inputSchema
-    elif hasattr(mcp_tool, 'parameters') and mcp_tool.parameters:
-        schema = mcp_tool.parameters
-    elif hasattr(mcp_tool, 'args') and mcp_tool.args:
-        schema = mcp_tool.args
-    else:
-        schema = {"type": "object", "properties": {}}
-    
-    return {"type": "function", "function": {"name": mcp_tool.name, "description": mcp_tool.description or "", "parameters": schema}}
+    return {"type": "function", "function": {"name": sys.intern(mcp_tool.name), "description": mcp_tool.description or "", "parameters": sort_keys(tool_schema(mcp_tool))}}
 
 def clean_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Ensure all messages have valid content fields for OpenAI API."""
@@ -145,41 +223,101 @@ def clean_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         cleaned.append(cleaned_msg)
     return cleaned
 
-async def call_openai(messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+class StreamContext:
+    """Accumulate streamed chat-completion deltas into one assistant message.
+
+    Tool-call argument fragments are buffered per `index` and only parsed once
+    the stream has finished, since intermediate fragments are not valid JSON.
+    """
+
+    def __init__(self):
+        self.content_parts: List[str] = []
+        self.tool_calls: Dict[int, Dict[str, Any]] = {}
+        self.finish_reason: Optional[str] = None
+        self.usage: Optional[Dict[str, Any]] = None
+
+    def feed(self, chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = []
+        if chunk.get("usage"):
+            self.usage = chunk["usage"]
+        for choice in chunk.get("choices") or []:
+            delta = choice.get("delta") or {}
+            text = delta.get("content")
+            if text:
+                self.content_parts.append(text)
+                events.append({"type": "text_delta", "text": text})
+            for tc in delta.get("tool_calls") or []:
+                index = tc.get("index", 0)
+                fn = tc.get("function") or {}
+                entry = self.tool_calls.get(index)
+                if entry is None:
+                    entry = {"id": tc.get("id") or "", "type": "function",
+                             "function": {"name": fn.get("name") or "", "arguments": ""}}
+                    self.tool_calls[index] = entry
+                    events.append({"type": "tool_call_start", "index": index, "id": entry["id"], "name": entry["function"]["name"]})
+                else:
+                    if tc.get("id"):
+                        entry["id"] = tc["id"]
+                    if fn.get("name"):
+                        entry["function"]["name"] = fn["name"]
+                if fn.get("arguments"):
+                    entry["function"]["arguments"] += fn["arguments"]
+                    events.append({"type": "tool_call_delta", "index": index, "arguments": fn["arguments"]})
+            if choice.get("finish_reason"):
+                self.finish_reason = choice["finish_reason"]
+        return events
+
+    def message(self) -> Dict[str, Any]:
+        msg: Dict[str, Any] = {"role": "assistant", "content": "".join(self.content_parts)}
+        if self.tool_calls:
+            msg["tool_calls"] = [self.tool_calls[i] for i in sorted(self.tool_calls)]
+        return msg
+
+async def call_openai(messages: List[Dict[str, Any]], tools: Sequence[Dict[str, Any]], user: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Stream a completion as events; the final event is {"type": "message", "message": ...}."""
     # Clean messages to ensure no null content values
     cleaned_messages = clean_messages(messages)
-    
-    if USE_NEW_OPENAI:
-        return oai_client.chat.completions.create(
-            model=OPENAI_MODEL, messages=cleaned_messages, tools=tools, tool_choice="auto", temperature=0.2
-        ).model_dump()
-    else:
-        return openai.ChatCompletion.create(
-            model=OPENAI_MODEL, messages=cleaned_messages, tools=tools, tool_choice="auto", temperature=0.2
-        )
+
+    # Replaying a sampled (temperature > 0) completion would pin one random draw,
+    # so only deterministic requests are cached.
+    key = None
+    if OPENAI_TEMPERATURE == 0:
+        key = llm_cache.cache_key(OPENAI_MODEL, cleaned_messages, tools, OPENAI_TEMPERATURE)
+    cached = await llm_cache.get(key) if key else None
+    if cached is not None:
+        log.debug("LLM cache hit: %s", key[:12])
+        if cached["content"]:
+            yield {"type": "text_delta", "text": cached["content"]}
+        yield {"type": "message", "message": cached}
+        return
+
+    stream = await open_completion_stream(
+        model=OPENAI_MODEL, messages=cleaned_messages, tools=tools, tool_choice="auto", temperature=OPENAI_TEMPERATURE,
+        **({"user": user} if user else {}),
+    )
+
+    ctx = StreamContext()
+    async for chunk in stream:
+        for event in ctx.feed(chunk_to_dict(chunk)):
+            yield event
+
+    message = ctx.message()
+    # Truncated or filtered replies (length, content_filter) must not be replayed.
+    if key and ctx.finish_reason in ("stop", "tool_calls"):
+        await llm_cache.set(key, message)
+    yield {"type": "message", "message": message, "usage": ctx.usage}
 
 async def mcp_connect_network():
     """Connect to an already-running MCP server over SSE."""
     if not HAS_SSE:
-        print("mcp.client.sse is unavailable; upgrade mcp package (pip install 'mcp>=1.9').")
         raise RuntimeError("mcp.client.sse is unavailable; upgrade mcp package (pip install 'mcp>=1.9').")
     if not MCP_URL:
-        print("MCP_URL not set. Example: MCP_URL=http://127.0.0.1:8001")
         raise RuntimeError("MCP_URL not set. Example: MCP_URL=http://127.0.0.1:8001")
-    print(f"reached here....")
     stack = AsyncExitStack()
-    print(f"stack: {stack}")
     await stack.__aenter__()
-    print(f"stack entered 2")
-    print(f"stack entered")
     reader, writer = await stack.enter_async_context(sse_client(MCP_URL))
-    print(f"reader, writer: {reader, writer}")
-    print(f"reader: {reader}")
-    print(f"writer: {writer}")
-    session = await stack.enter_async_context(ClientSession(reader, writer))
-    print(f"session: {session}")
-    await session.initialize()  
-    print(f"session initialized")
+    session = await stack.enter_async_context(ClientSession(reader, writer, read_timeout_seconds=MCP_TIMEOUT))
+    await session.initialize()
     return session, stack
 
 async def mcp_connect_stdio():
@@ -188,23 +326,17 @@ async def mcp_connect_stdio():
     stack = AsyncExitStack()
     await stack.__aenter__()
     reader, writer = await stack.enter_async_context(stdio_client(params))
-    session = await stack.enter_async_context(ClientSession(reader, writer))
+    session = await stack.enter_async_context(ClientSession(reader, writer, read_timeout_seconds=MCP_TIMEOUT))
     await session.initialize()
     return session, stack
 
 async def mcp_discover(session: ClientSession) -> Dict[str, Any]:
     tools_resp = await session.list_tools()
     res_resp = await session.list_resources()
-    print(f"mcp_discover tools: {tools_resp.tools}")
-    print(f"mcp_discover resources: {res_resp.resources}")
     return {"tools": tools_resp.tools or [], "resources": res_resp.resources or []}
 
 async def mcp_call_tool(session: ClientSession, name: str, args: Dict[str, Any]) -> str:
-    print(f"mcp_call_tool: {name}, {args}")
     result = await session.call_tool(name=name, arguments=args or {})
-    print(f"mcp_call_tool result: {result}")
-    print(f"mcp_call_tool result type: {type(result)}")
-    print(f"mcp_call_tool result attributes: {dir(result)}")
     
     parts: List[str] = []
     
@@ -217,7 +349,7 @@ async def mcp_call_tool(session: ClientSession, name: str, args: Dict[str, Any])
                 parts.append(text)
             else:
                 with contextlib.suppress(Exception):
-                    parts.append(json.dumps(item.model_dump(), ensure_ascii=False))
+                    parts.append(orjson.dumps(item.model_dump(), default=str).decode())
     elif hasattr(result, 'text') and result.text:
         # Direct text result
         parts.append(result.text)
@@ -225,41 +357,64 @@ async def mcp_call_tool(session: ClientSession, name: str, args: Dict[str, Any])
         # Try to serialize the entire result object
         try:
             if hasattr(result, 'model_dump'):
-                parts.append(json.dumps(result.model_dump(), ensure_ascii=False, indent=2))
+                parts.append(orjson.dumps(result.model_dump(), default=str, option=orjson.OPT_INDENT_2).decode())
             else:
-                parts.append(json.dumps(result, ensure_ascii=False, indent=2))
+                parts.append(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
         except Exception as e:
             parts.append(f"Error serializing result: {e}")
             parts.append(str(result))
     
     result_text = "\n".join(parts) if parts else "(no result)"
-    print(f"mcp_call_tool final result: {result_text}")
     return result_text
 
-async def execute_tool_calls(session: ClientSession, tool_calls: List[Dict[str, Any]]) -> None:
-    """Execute a list of tool calls and add results to messages."""
-    for tc in tool_calls:
-        name = tc["function"]["name"]
-        args_json = tc["function"].get("arguments") or "{}"
-        print(f"Executing tool: {name} with args: {args_json}")
-        try:
-            args = json.loads(args_json) if isinstance(args_json, str) else args_json
-        except Exception:
-            args = {}
+def parse_tool_call(tc: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    name = tc["function"]["name"]
+    args_json = tc["function"].get("arguments") or "{}"
+    try:
+        args = orjson.loads(args_json) if isinstance(args_json, str) else args_json
+    except Exception:
+        args = {}
+    return name, args if isinstance(args, dict) else {}
+
+async def execute_tool_call(session: ClientSession, name: str, args: Dict[str, Any]) -> str:
+    log.debug("Executing tool: %s with args: %s", name, args)
+    handler = app.state.dispatch.get(name)
+    if handler is None:
+        return f"Error: Unknown tool: {name}"
+    result_text = await handler(session, args)
+
+    log.debug("Tool result for %s: %d chars", name, len(result_text))
+    return result_text
 
-        if name == "mcp_read_resource":
-            result_text = await mcp_read_resource(session, args.get("uri", ""))
-        else:
-            result_text = await mcp_call_tool(session, name, args)
+async def execute_tool_calls(session: ClientSession, tool_calls: List[Dict[str, Any]]) -> List[str]:
+    """Execute a list of tool calls concurrently and return their results in the same order.
 
-        print(f"Tool result for {name}: '{result_text}'")
-        return result_text  # Return the last result for simplicity
+    Calls with identical (name, arguments) run once and share the result.
+    """
+    unique: Dict[Tuple[str, bytes], Tuple[str, Dict[str, Any]]] = {}
+    keys: List[Tuple[str, bytes]] = []
+    for tc in tool_calls:
+        name, args = parse_tool_call(tc)
+        key = (name, orjson.dumps(args, option=orjson.OPT_SORT_KEYS))
+        unique.setdefault(key, (name, args))
+        keys.append(key)
+
+    results = await asyncio.gather(*(execute_tool_call(session, name, args) for name, args in unique.values()),
+                                   return_exceptions=True)
+    by_key: Dict[Tuple[str, bytes], str] = {}
+    for key, r in zip(unique, results):
+        if isinstance(r, McpError) and not is_mcp_transport_error(r):
+            # A rejected call shouldn't sink its siblings; report the error to the model instead.
+            by_key[key] = f"Error: {r}"
+        elif isinstance(r, BaseException):
+            # Transport failures propagate so the caller can reset the session.
+            raise r
+        else:
+            by_key[key] = r
+    return [by_key[key] for key in keys]
 
 async def mcp_read_resource(session: ClientSession, uri: str) -> str:
-    print(f"mcp_read_resource: {uri}")
     res = await session.read_resource(uri)
-    print(f"mcp_read_resource result: {res}")
-    print(f"mcp_read_resource result type: {type(res)}")
     
     parts: List[str] = []
     
@@ -271,21 +426,20 @@ async def mcp_read_resource(session: ClientSession, uri: str) -> str:
                 parts.append(text)
             else:
                 with contextlib.suppress(Exception):
-                    parts.append(json.dumps(item.model_dump(), ensure_ascii=False))
+                    parts.append(orjson.dumps(item.model_dump(), default=str).decode())
     elif hasattr(res, 'text') and res.text:
         parts.append(res.text)
     else:
         try:
             if hasattr(res, 'model_dump'):
-                parts.append(json.dumps(res.model_dump(), ensure_ascii=False, indent=2))
+                parts.append(orjson.dumps(res.model_dump(), default=str, option=orjson.OPT_INDENT_2).decode())
             else:
-                parts.append(json.dumps(res, ensure_ascii=False, indent=2))
+                parts.append(orjson.dumps(res, option=orjson.OPT_INDENT_2).decode())
         except Exception as e:
             parts.append(f"Error serializing resource: {e}")
             parts.append(str(res))
     
     result_text = "\n".join(parts) if parts else "(no content)"
-    print(f"mcp_read_resource final result: {result_text}")
     return result_text
 
 RESOURCE_READER = {
@@ -297,10 +451,319 @@ RESOURCE_READER = {
     },
 }
 
+ToolHandler = Callable[[ClientSession, Dict[str, Any]], Awaitable[str]]
+
+def make_tool_handler(name: str, schema: Dict[str, Any]) -> ToolHandler:
+    """Bind a tool name to a call closure, checking arguments with a schema-specialized validator.
+
+    The model's arguments are forwarded unchanged: the server applies its own
+    defaults and coerces loose types (e.g. "50" for an integer), so only a
+    missing required argument, which the server would also reject, is refused here.
+    """
+    validate = None
+    if HAS_FASTJSONSCHEMA:
+        try:
+            validate = fastjsonschema.compile(schema, use_default=False)
+        except Exception as e:
+            log.warning("Not validating arguments for %s: %s", name, e)
+
+    async def handler(session: ClientSession, args: Dict[str, Any]) -> str:
+        if validate is not None:
+            try:
+                validate(args)
+            except fastjsonschema.JsonSchemaValueException as e:
+                if e.rule == "required":
+                    # Let the model see what was wrong and retry, rather than round-tripping to the server.
+                    return f"Error: invalid arguments for {name}: {e.message}"
+                log.debug("Passing %s arguments the server may coerce: %s", name, e.message)
+        return await mcp_call_tool(session, name, args)
+
+    return handler
+
+async def read_resource_handler(session: ClientSession, args: Dict[str, Any]) -> str:
+    return await mcp_read_resource(session, args.get("uri", ""))
+
+def build_dispatch(mcp_tools: List[Any]) -> Dict[str, ToolHandler]:
+    """Tool name -> handler, for every discovered tool plus the resource reader."""
+    dispatch = {t.name: make_tool_handler(t.name, tool_schema(t)) for t in mcp_tools}
+    dispatch[RESOURCE_READER["function"]["name"]] = read_resource_handler
+    return dispatch
+
+async def mcp_open() -> Dict[str, Any]:
+    """Connect to the MCP server and discover its tools/resources."""
+    # Prefer network if MCP_URL is set; else fallback to stdio spawn
+    if MCP_URL:
+        session, stack = await mcp_connect_network()
+        log.info("MCP server connected over network: %s", MCP_URL)
+    else:
+        # Optional: guard against missing entry file when falling back
+        if not Path(MCP_ENTRY).exists():
+            raise RuntimeError(f"MCP_ENTRY not found: {MCP_ENTRY}")
+        session, stack = await mcp_connect_stdio()
+
+    try:
+        discovered = await mcp_discover(session)
+    except Exception:
+        with contextlib.suppress(Exception):
+            await stack.aclose()
+        raise
+    mcp_tools = discovered["tools"]
+    mcp_resources = discovered["resources"]
+
+    log.info("Discovered %d MCP tools, %d resources", len(mcp_tools), len(mcp_resources))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("MCP tools: %s", [t.name for t in mcp_tools])
+        log.debug("MCP resources: %s", [str(r.uri) for r in mcp_resources])
+
+    return {"session": session, "stack": stack, "tools": mcp_tools, "resources": mcp_resources}
+
+async def mcp_run_connection(ready: asyncio.Future, stop: asyncio.Event) -> None:
+    """Own the shared MCP connection until `stop` is set.
+
+    The SSE/STDIO clients open anyio task groups, which must be exited from the
+    task that entered them, so the connection lives in its own background task.
+    """
+    try:
+        conn = await mcp_open()
+    except Exception as e:
+        ready.set_exception(e)
+        return
+    ready.set_result(conn)
+    try:
+        await stop.wait()
+    finally:
+        with contextlib.suppress(Exception):
+            await conn["stack"].aclose()
+
+async def mcp_ensure_connected() -> ClientSession:
+    """Return the shared MCP session, connecting and discovering tools on first use."""
+    if app.state.mcp_session is not None:
+        return app.state.mcp_session
+    async with app.state.mcp_lock:
+        if app.state.mcp_session is not None:
+            return app.state.mcp_session
+
+        ready = asyncio.get_running_loop().create_future()
+        stop = asyncio.Event()
+        task = asyncio.create_task(mcp_run_connection(ready, stop))
+        conn = await ready
+
+        app.state.mcp_tools_cache = conn["tools"]
+        # Built once per connection and passed as-is to every OpenAI call.
+        app.state.oai_tools = tuple(to_openai_tool(t) for t in conn["tools"]) + (RESOURCE_READER,)
+        app.state.tool_names = [t.name for t in conn["tools"]]
+        app.state.dispatch = build_dispatch(conn["tools"])
+        app.state.system_messages = build_dynamic_system_prompt(conn["tools"], conn["resources"])
+        app.state.mcp_stop = stop
+        app.state.mcp_task = task
+        app.state.mcp_session = conn["session"]
+        app.state.router = await build_router(conn["session"], conn["tools"])
+        return conn["session"]
+
+async def embed_texts(texts: List[str]) -> List[List[float]]:
+    resp = await oai_client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+    return [d.embedding for d in resp.data]
+
+async def router_vocabulary(session: ClientSession) -> Tuple[Dict[str, Set[str]], List[Dict[str, str]]]:
+    """Known customer/cluster names and the pairs that exist, read from the list_clusters tool."""
+    vocab: Dict[str, Set[str]] = {"customer": set(), "cluster": set()}
+    combos: List[Dict[str, str]] = []
+    if "list_clusters" not in app.state.tool_names:
+        return vocab, combos
+    text = await mcp_call_tool(session, "list_clusters", {})
+    try:
+        items = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # One content item per cluster, joined by newlines
+        items = [orjson.loads(line) for line in text.splitlines() if line.strip()]
+    for item in items if isinstance(items, list) else [items]:
+        if isinstance(item, dict):
+            if item.get("customer"):
+                vocab["customer"].add(item["customer"])
+            if item.get("name"):
+                vocab["cluster"].add(item["name"])
+            if item.get("customer") and item.get("name"):
+                combos.append({"customer": item["customer"], "cluster": item["name"]})
+    return vocab, combos
+
+async def build_router(session: ClientSession, mcp_tools: List[Any]) -> Optional[ToolRouter]:
+    if not (ROUTER_ENABLED and USE_NEW_OPENAI and os.getenv("OPENAI_API_KEY")):
+        return None
+    try:
+        router = ToolRouter(embed_texts, EMBEDDING_MODEL, threshold=ROUTER_THRESHOLD, cache_path=ROUTER_CACHE_PATH)
+        await router.prepare([(t.name, t.description or "", tool_schema(t)) for t in mcp_tools if t.name in ROUTER_TOOLS],
+                             *await router_vocabulary(session))
+        return router
+    except Exception as e:
+        # Routing is an optimization; without it every request takes the full LLM path.
+        log.warning("Tool router disabled: %s: %s", type(e).__name__, e)
+        return None
+
+async def mcp_reset(session: Optional[ClientSession] = None) -> None:
+    """Close the shared MCP session; the next mcp_ensure_connected() reconnects.
+
+    When `session` is given, only close it if it is still the shared one, so a
+    late failure on an old connection can't tear down a freshly reopened one.
+    """
+    async with app.state.mcp_lock:
+        if session is not None and app.state.mcp_session is not session:
+            return
+        stop, task = app.state.mcp_stop, app.state.mcp_task
+        app.state.mcp_session = None
+        app.state.mcp_stop = None
+        app.state.mcp_task = None
+    if stop:
+        stop.set()
+        # gather() also absorbs CancelledError, which would otherwise escape into the caller.
+        await asyncio.gather(task, return_exceptions=True)
+
 @app.get("/")
 async def index():
     return FileResponse(Path(__file__).with_name("index.html"))
 
+@app.get("/metrics")
+async def metrics():
+    return {"llm_cache": llm_cache.stats()}
+
+async def trim_sessions_periodically() -> None:
+    while True:
+        await asyncio.sleep(SESSION_TRIM_INTERVAL)
+        try:
+            await session_store.trim_all(SESSION_MAX_MESSAGES)
+        except Exception as e:
+            log.warning("Session trim failed: %s: %s", type(e).__name__, e)
+
+@app.on_event("startup")
+async def startup():
+    app.state.trim_task = asyncio.create_task(trim_sessions_periodically())
+    try:
+        await mcp_ensure_connected()
+    except Exception as e:
+        # The MCP server may not be up yet; the first /chat request retries.
+        log.warning("MCP connect at startup failed, will retry on first request: %s: %s", type(e).__name__, e)
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.trim_task.cancel()
+    await jobs.close()
+    await mcp_reset()
+    await session_store.close()
+    if USE_NEW_OPENAI:
+        await oai_http.aclose()
+
+MAX_ROUNDS = 5  # Prevent infinite tool-calling loops
+
+def sse(event: Dict[str, Any]) -> str:
+    return f"data: {orjson.dumps(event).decode()}\n\n"
+
+async def run_chat(session: ClientSession, session_id: str, user_text: str) -> AsyncIterator[Dict[str, Any]]:
+    """Run the tool-calling loop for one user message, yielding stream events.
+
+    Ends with {"type": "done", "reply": ..., "tools": [...]}.
+    """
+    oai_tools = app.state.oai_tools
+    tool_names = app.state.tool_names
+
+    # Build messages with dynamic system prompt that includes discovered tools/resources
+    history = await session_store.get(session_id)
+    messages = build_messages(history, app.state.system_messages)
+    # Everything from here on is new this turn and gets appended to the session.
+    turn_start = len(messages)
+    messages.append({"role": "user", "content": user_text})
+
+    content = ""
+    tokens = 0
+    router = app.state.router
+    if router is not None:
+        try:
+            routed = await router.route(user_text)
+        except Exception as e:
+            log.warning("Tool routing failed: %s: %s", type(e).__name__, e)
+            routed = None
+        if routed:
+            # Call the tool ourselves, as if the model had asked for it; round 1 then only summarizes.
+            name, args, score = routed
+            log.debug("Routed to %s (score %.3f) with %s", name, score, args)
+            tc = {"id": f"call_route_{uuid.uuid4().hex[:16]}", "type": "function",
+                  "function": {"name": name, "arguments": orjson.dumps(args).decode()}}
+            yield {"type": "tool_call_start", "index": 0, "id": tc["id"], "name": name}
+            messages.append({"role": "assistant", "content": "", "tool_calls": [tc]})
+            [result_text] = await execute_tool_calls(session, [tc])
+            messages.append({"role": "tool", "tool_call_id": tc["id"], "content": result_text})
+            yield {"type": "tool_result", "id": tc["id"], "name": name}
+
+    # Keep calling OpenAI until we get a final response (no more tool calls)
+    for round_num in range(1, MAX_ROUNDS + 1):
+        log.debug("Round %d - calling OpenAI with %d messages", round_num, len(messages))
+        msg: Dict[str, Any] = {}
+        async for event in call_openai(messages, oai_tools, user=session_id):
+            if event["type"] == "message":
+                msg = event["message"]
+                tokens += (event.get("usage") or {}).get("total_tokens", 0)
+            else:
+                yield event
+        content = msg.get("content") or ""
+        tool_calls = msg.get("tool_calls")
+        log.debug("Round %d - %d chars, %d tool calls", round_num, len(content), len(tool_calls) if tool_calls else 0)
+
+        if not tool_calls:
+            # No more tool calls, we have our final answer
+            break
+
+        messages.append({"role": "assistant", "content": content, "tool_calls": tool_calls})
+        results = await execute_tool_calls(session, tool_calls)
+        for tc, result_text in zip(tool_calls, results):
+            messages.append({"role": "tool", "tool_call_id": tc["id"], "content": result_text})
+            yield {"type": "tool_result", "id": tc["id"], "name": tc["function"]["name"]}
+
+    else:
+        # If we hit max rounds, return the last content
+        log.warning("Hit max rounds (%d) for session %s, returning last response", MAX_ROUNDS, session_id)
+
+    messages.append({"role": "assistant", "content": content})
+    await session_store.append(session_id, messages[turn_start:])
+    log.info("chat done", extra={"session": session_id, "rounds": round_num, "tokens": tokens})
+    yield {"type": "done", "reply": content, "tools": tool_names}
+
+async def chat_events(session: ClientSession, session_id: str, buffer: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Run the chat for a batch of buffered user messages, turning failures into an error event.
+
+    Waits CHAT_DEBOUNCE_MS first so rapid follow-up messages land in `buffer`,
+    then runs under the session's lock so batches for one session never overlap.
+    """
+    if CHAT_DEBOUNCE_MS > 0:
+        await asyncio.sleep(CHAT_DEBOUNCE_MS / 1000)
+    # Close the batch; later messages start a new one.
+    pending = app.state.pending_chats.get(session_id)
+    if pending is not None and pending["buffer"] is buffer:
+        del app.state.pending_chats[session_id]
+    user_text = "\n".join(buffer)
+
+    entry = app.state.buf_locks.setdefault(session_id, {"lock": asyncio.Lock(), "users": 0})
+    entry["users"] += 1
+    try:
+        async with entry["lock"]:
+            async for event in run_chat(session, session_id, user_text):
+                yield event
+    except Exception as e:
+        # Only a dead MCP connection warrants a reconnect; OpenAI/Redis errors leave it alone.
+        if is_mcp_transport_error(e):
+            await mcp_reset(session)
+        yield {"type": "error", "error": f"{type(e).__name__}: {e}"}
+    finally:
+        entry["users"] -= 1
+        if not entry["users"]:
+            app.state.buf_locks.pop(session_id, None)
+
+def stream_job(job: Job) -> StreamingResponse:
+    async def event_stream() -> AsyncIterator[str]:
+        yield sse({"type": "job", "job_id": job.id})
+        async for event in job.subscribe():
+            yield sse(event)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.post("/chat")
 async def chat(req: Request):
     data = await req.json()
@@ -308,153 +771,41 @@ async def chat(req: Request):
     session_id: str = (data.get("session_id") or "default").strip()
 
     if not user_text:
-        return JSONResponse({"error": "Empty message"}, status_code=400)
+        return ORJSONResponse({"error": "Empty message"}, status_code=400)
     if not os.getenv("OPENAI_API_KEY"):
-        return JSONResponse({"error": "OPENAI_API_KEY not set"}, status_code=500)
-    session = None
-    stack = None
+        return ORJSONResponse({"error": "OPENAI_API_KEY not set"}, status_code=500)
     try:
-        # Prefer network if MCP_URL is set; else fallback to stdio spawn
-        if MCP_URL:
-            session, stack = await mcp_connect_network()
-            print("mcp server connected over network")
-        else:
-            # Optional: guard against missing entry file when falling back
-            if not Path(MCP_ENTRY).exists():
-                return JSONResponse({"error": f"MCP_ENTRY not found: {MCP_ENTRY}"}, status_code=500)
-            session, stack = await mcp_connect_stdio()
-
-        discovered = await mcp_discover(session)
-        mcp_tools = discovered["tools"]
-        mcp_resources = discovered["resources"]
-        
-        print(f"Available MCP tools: {[t.name for t in mcp_tools]}")
-        print(f"Available MCP resources: {[r.uri for r in mcp_resources]}")
-        
-        for tool in mcp_tools:
-            print(f"Tool: {tool.name}")
-            print(f"  Description: {tool.description}")
-            print(f"  Tool type: {type(tool)}")
-            print(f"  Tool attributes: {[attr for attr in dir(tool) if not attr.startswith('_')]}")
-            
-            # Try to find the schema attribute
-            schema_attr = None
-            for attr in ['input_schema', 'inputSchema', 'parameters', 'args']:
-                if hasattr(tool, attr):
-                    schema_attr = attr
-                    break
-            
-            if schema_attr:
-                print(f"  Schema attribute: {schema_attr} = {getattr(tool, schema_attr)}")
-            else:
-                print(f"  No schema attribute found")
-        
-        oai_tools = [to_openai_tool(t) for t in mcp_tools]
-        oai_tools.append(RESOURCE_READER)
-        print(f"OpenAI tools being sent: {[t['function']['name'] for t in oai_tools]}")
-
-        # Build messages with dynamic system prompt that includes discovered tools/resources
-        messages = build_messages(session_id, mcp_tools, mcp_resources)
-        messages.append({"role": "user", "content": user_text})
-        
-        # Show the dynamic system prompt
-        system_msg = messages[0] if messages and messages[0].get("role") == "system" else None
-        if system_msg:
-            print(f"Dynamic system prompt: {system_msg['content'][:300]}...")
-
-        # Round 1 (let model decide to call tools)
-        print(f"Sending to OpenAI - messages: {len(messages)}, tools: {len(oai_tools)}")
-        print(f"Messages: {[{'role': m['role'], 'content': m['content'][:100] + '...' if len(m.get('content', '')) > 100 else m.get('content', '')} for m in messages]}")
-        
-        resp = await call_openai(messages, oai_tools)
-        print(f"OpenAI response: {resp}")
-        choice = (resp["choices"][0] if USE_NEW_OPENAI else resp.choices[0])
-        msg = choice["message"] if USE_NEW_OPENAI else choice.message
-        tool_calls = msg.get("tool_calls") if USE_NEW_OPENAI else getattr(msg, "tool_calls", None)
-        print(f"Message content: {msg.get('content')}")
-        print(f"Tool calls: {tool_calls}")
-        print(f"Tool calls length: {len(tool_calls) if tool_calls else 0}")
-        
-        if tool_calls:
-            print(f"AI decided to call {len(tool_calls)} tool(s)")
-            messages.append({"role": "assistant", "content": msg.get("content") or "", "tool_calls": tool_calls})
-            for tc in tool_calls:
-                name = tc["function"]["name"]
-                args_json = tc["function"].get("arguments") or "{}"
-                print(f"Calling tool: {name} with args: {args_json}")
-                try:
-                    args = json.loads(args_json) if isinstance(args_json, str) else args_json
-                except Exception:
-                    args = {}
-
-                if name == "mcp_read_resource":
-                    result_text = await mcp_read_resource(session, args.get("uri", ""))
-                else:
-                    result_text = await mcp_call_tool(session, name, args)
-
-                print(f"Tool result for {name}: '{result_text}'")
-                messages.append({"role": "tool", "tool_call_id": tc["id"], "content": result_text})
-
-            # Keep calling OpenAI until we get a final response (no more tool calls)
-            max_rounds = 5  # Prevent infinite loops
-            for round_num in range(2, max_rounds + 1):
-                print(f"Round {round_num} - calling OpenAI with {len(messages)} messages")
-                resp = await call_openai(messages, oai_tools)
-                print(f"Round {round_num} OpenAI response: {resp}")
-                choice = (resp["choices"][0] if USE_NEW_OPENAI else resp.choices[0])
-                msg = choice["message"] if USE_NEW_OPENAI else choice.message
-                content = msg.get("content") or ""
-                tool_calls = msg.get("tool_calls") if USE_NEW_OPENAI else getattr(msg, "tool_calls", None)
-                
-                print(f"Round {round_num} - Content: '{content}'")
-                print(f"Round {round_num} - Tool calls: {len(tool_calls) if tool_calls else 0}")
-                
-                if tool_calls:
-                    print(f"Round {round_num} - AI wants to make {len(tool_calls)} more tool calls")
-                    messages.append({"role": "assistant", "content": content, "tool_calls": tool_calls})
-                    
-                    # Execute the tool calls
-                    for tc in tool_calls:
-                        name = tc["function"]["name"]
-                        args_json = tc["function"].get("arguments") or "{}"
-                        print(f"Round {round_num} - Calling tool: {name} with args: {args_json}")
-                        try:
-                            args = json.loads(args_json) if isinstance(args_json, str) else args_json
-                        except Exception:
-                            args = {}
-
-                        if name == "mcp_read_resource":
-                            result_text = await mcp_read_resource(session, args.get("uri", ""))
-                        else:
-                            result_text = await mcp_call_tool(session, name, args)
-
-                        print(f"Round {round_num} - Tool result for {name}: '{result_text}'")
-                        messages.append({"role": "tool", "tool_call_id": tc["id"], "content": result_text})
-                else:
-                    # No more tool calls, we have our final answer
-                    print(f"Round {round_num} - Final answer: '{content}'")
-                    messages.append({"role": "assistant", "content": content})
-                    SESSIONS[session_id] = messages
-                    return JSONResponse({"reply": content, "tools": [t.name for t in mcp_tools]})
-            
-            # If we hit max rounds, return the last content
-            print(f"Hit max rounds ({max_rounds}), returning last response")
-            messages.append({"role": "assistant", "content": content})
-            SESSIONS[session_id] = messages
-            return JSONResponse({"reply": content, "tools": [t.name for t in mcp_tools]})
-
-        # No tools used
-        assistant_text = msg.get("content") or ""
-        print(f"No tools used - AI chose not to call any tools")
-        print(f"Assistant text: '{assistant_text}'")
-        print(f"Available tools were: {[t['function']['name'] for t in oai_tools]}")
-        messages.append({"role": "assistant", "content": assistant_text})
-        SESSIONS[session_id] = messages
-        return JSONResponse({"reply": assistant_text, "tools": [t.name for t in mcp_tools]})
-
+        session = await mcp_ensure_connected()
     except Exception as e:
-        return JSONResponse({"error": f"{type(e).__name__}: {e}"}, status_code=500)
-    finally:
-        if stack:
-            with contextlib.suppress(Exception):
-                await stack.aclose()
+        return ORJSONResponse({"error": f"{type(e).__name__}: {e}"}, status_code=500)
+
+    # A message arriving while an earlier one is still in its debounce window
+    # joins that batch instead of starting another OpenAI round-trip.
+    pending = app.state.pending_chats.get(session_id)
+    if pending is not None:
+        pending["buffer"].append(user_text)
+        return {"queued": True, "job_id": pending["job"].id}
+
+    # The tool loop runs as a background job, so it finishes (and history is
+    # saved) even if the client disconnects mid-stream.
+    buffer = [user_text]
+    job = jobs.submit(chat_events(session, session_id, buffer))
+    if CHAT_DEBOUNCE_MS > 0:
+        app.state.pending_chats[session_id] = {"buffer": buffer, "job": job}
+    if data.get("background"):
+        return {"job_id": job.id}
+    return stream_job(job)
+
+@app.get("/chat/{job_id}")
+async def chat_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return ORJSONResponse({"error": f"Unknown job: {job_id}"}, status_code=404)
+    return job.summary()
+
+@app.get("/chat/{job_id}/stream")
+async def chat_job_stream(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return ORJSONResponse({"error": f"Unknown job: {job_id}"}, status_code=404)
+    return stream_job(job)
@@ -0,0 +1,92 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+class Job:
+    """One background chat run: its status plus every event it has emitted so far."""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = "pending"
+        self.result: Optional[Dict[str, Any]] = None
+        self.events: List[Dict[str, Any]] = []
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+
+    async def publish(self, event: Dict[str, Any]) -> None:
+        async with self._changed:
+            self.events.append(event)
+            if event["type"] in ("done", "error"):
+                self.status = event["type"]
+                self.result = event
+                self.finished_at = time.monotonic()
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[Dict[str, Any]]:
+        """Replay the events so far, then follow new ones until the job finishes."""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: sent < len(self.events) or self.finished)
+                pending = self.events[sent:]
+                finished = self.finished
+            for event in pending:
+                yield event
+            sent += len(pending)
+            if finished and sent == len(self.events):
+                return
+
+    def summary(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"job_id": self.id, "status": self.status}
+        if self.result is not None:
+            out.update({k: v for k, v in self.result.items() if k != "type"})
+        return out
+
+
+class JobRegistry:
+    """Runs chat pipelines as asyncio tasks and keeps finished jobs around for `ttl` seconds."""
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, events: AsyncIterator[Dict[str, Any]]) -> Job:
+        self._prune()
+        job = Job()
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job, events))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: Job, events: AsyncIterator[Dict[str, Any]]) -> None:
+        job.status = "running"
+        try:
+            async for event in events:
+                await job.publish(event)
+        except Exception as e:
+            await job.publish({"type": "error", "error": f"{type(e).__name__}: {e}"})
+        if not job.finished:
+            await job.publish({"type": "error", "error": "job ended without a reply"})
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at is not None and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
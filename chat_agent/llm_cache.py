@@ -0,0 +1,64 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+
+class LLMCache:
+    """In-memory LRU + TTL cache for chat completion responses.
+
+    Keys are a SHA-256 over the full request payload, so a hit is only possible
+    when model, messages, tools and temperature are byte-for-byte identical.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._tools_memo: Optional[Tuple[Sequence[Dict[str, Any]], bytes]] = None
+
+    def cache_key(self, model: str, messages: List[Dict[str, Any]], tools: Sequence[Dict[str, Any]], temperature: float) -> str:
+        payload = {"model": model, "messages": messages, "temperature": temperature}
+        digest = hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str))
+        digest.update(self._tools_json(tools))
+        return digest.hexdigest()
+
+    def _tools_json(self, tools: Sequence[Dict[str, Any]]) -> bytes:
+        # The tool list is the same object across requests; serialize it once.
+        # Holding a reference keeps its id from being reused by a different list.
+        memo = self._tools_memo
+        if memo is None or memo[0] is not tools:
+            memo = (tools, orjson.dumps(tools, option=orjson.OPT_SORT_KEYS, default=str))
+            self._tools_memo = memo
+        return memo[1]
+
+    async def get(self, key: str) -> Optional[Any]:
+        async with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    async def set(self, key: str, value: Any) -> None:
+        async with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
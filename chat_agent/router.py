@@ -0,0 +1,108 @@
+import hashlib
+import math
+import re
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import orjson
+
+Embedder = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def _normalize(vec: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
+
+
+class ToolRouter:
+    """Route a user message straight to one MCP tool when the match is unambiguous.
+
+    Tool descriptions are embedded once (and cached on disk); each message is
+    embedded and compared by cosine similarity. A route is only returned when
+    the best score clears `threshold` and every required argument can be read
+    from the message, so low-confidence messages fall back to the full LLM loop.
+    Messages naming several known values for one argument, or a combination of
+    values that doesn't exist (e.g. a cluster under the wrong customer), also
+    fall back.
+    """
+
+    def __init__(self, embed: Embedder, model: str, threshold: float = 0.85, cache_path: Optional[Path] = None):
+        self.embed = embed
+        self.model = model
+        self.threshold = threshold
+        self.cache_path = cache_path
+        self._tools: List[Tuple[str, Dict[str, Any], List[float]]] = []
+        self._vocab: Dict[str, Set[str]] = {}
+        self._combos: List[Dict[str, str]] = []
+
+    async def prepare(self, tools: Sequence[Tuple[str, str, Dict[str, Any]]], vocab: Dict[str, Set[str]],
+                      combos: Sequence[Dict[str, str]] = ()) -> None:
+        """Embed (name, description, schema) for each tool.
+
+        `vocab` maps argument names to known values; `combos` lists the known
+        values that belong together (e.g. {"customer": ..., "cluster": ...}).
+        """
+        cache: Dict[str, List[float]] = {}
+        if self.cache_path and self.cache_path.exists():
+            cache = orjson.loads(self.cache_path.read_bytes())
+
+        texts = {name: f"{name}: {description}" for name, description, _ in tools}
+        keys = {name: hashlib.sha256(f"{self.model}\0{text}".encode()).hexdigest() for name, text in texts.items()}
+        missing = [name for name in texts if keys[name] not in cache]
+        if missing:
+            vectors = await self.embed([texts[name] for name in missing])
+            for name, vec in zip(missing, vectors):
+                cache[keys[name]] = vec
+            if self.cache_path:
+                self.cache_path.write_bytes(orjson.dumps(cache))
+
+        self._tools = [(name, schema, _normalize(cache[keys[name]])) for name, _, schema in tools]
+        self._vocab = vocab
+        self._combos = list(combos)
+
+    async def route(self, text: str) -> Optional[Tuple[str, Dict[str, Any], float]]:
+        """Return (tool name, arguments, score) for a confident match, else None."""
+        if not self._tools:
+            return None
+        [vec] = await self.embed([text])
+        vec = _normalize(vec)
+        score, name, schema = max((sum(a * b for a, b in zip(vec, tvec)), name, schema) for name, schema, tvec in self._tools)
+        if score < self.threshold:
+            return None
+        args = self.extract_args(schema, text)
+        if args is None:
+            return None
+        return name, args, score
+
+    def extract_args(self, schema: Dict[str, Any], text: str) -> Optional[Dict[str, Any]]:
+        """Fill arguments from known values named in the text, or `arg=value` / `arg: value` pairs."""
+        args: Dict[str, Any] = {}
+        for prop, spec in (schema.get("properties") or {}).items():
+            found = [value for value in self._vocab.get(prop, ())
+                     if re.search(rf"(?<![\w.-]){re.escape(value)}(?![\w.-])", text, re.IGNORECASE)]
+            if len(found) > 1:
+                # Ambiguous (e.g. comparing two clusters); let the model decide.
+                return None
+            if found:
+                args[prop] = found[0]
+            else:
+                m = re.search(rf"\b{re.escape(prop)}\s*[=:]\s*([\w.\-]+)", text, re.IGNORECASE)
+                if m:
+                    value = m.group(1)
+                    if (spec or {}).get("type") == "integer":
+                        if not value.isdigit():
+                            continue
+                        value = int(value)
+                    args[prop] = value
+        if any(req not in args for req in schema.get("required") or []):
+            return None
+        if not self._consistent(args):
+            return None
+        return args
+
+    def _consistent(self, args: Dict[str, Any]) -> bool:
+        """Values from two or more related arguments must appear together in one known combo."""
+        related = {k for combo in self._combos for k in combo}
+        if sum(1 for k in args if k in related) < 2:
+            return True
+        return any(all(combo[k] == v for k, v in args.items() if k in combo) for combo in self._combos)
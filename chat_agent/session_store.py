@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+# Optional: only needed when REDIS_URL is set (pip install redis)
+try:
+    import redis.asyncio as aioredis
+    HAS_REDIS = True
+except Exception:
+    HAS_REDIS = False
+
+
+class SessionStore:
+    """Per-session message history.
+
+    Hot sessions live in a bounded in-process LRU. When a Redis URL is given,
+    each session is also kept as a Redis LIST of JSON-encoded messages with a
+    TTL, so history survives restarts and is shared by every worker.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, maxsize: int = 1000, ttl: int = 7200):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lru: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        # Redis version each cached history corresponds to (see _version_key)
+        self._versions: Dict[str, int] = {}
+        self._redis = None
+        if redis_url:
+            if not HAS_REDIS:
+                raise RuntimeError("REDIS_URL is set but the redis package is missing (pip install 'redis>=5.0').")
+            self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"session:{session_id}:messages"
+
+    @staticmethod
+    def _version_key(session_id: str) -> str:
+        # INCRed by every write (set/append/trim), so any change by any worker is visible.
+        return f"session:{session_id}:version"
+
+    def _remember(self, session_id: str, messages: List[Dict[str, Any]], version: int = 0) -> None:
+        self._lru[session_id] = messages
+        self._versions[session_id] = version
+        self._lru.move_to_end(session_id)
+        while len(self._lru) > self.maxsize:
+            evicted, _ = self._lru.popitem(last=False)
+            self._versions.pop(evicted, None)
+
+    def _forget(self, session_id: str) -> None:
+        self._lru.pop(session_id, None)
+        self._versions.pop(session_id, None)
+
+    def _track_write(self, session_id: str, expected: int, new_version: int) -> None:
+        # If anyone else wrote since our read, the local copy is no longer exact.
+        if new_version == expected + 1 and session_id in self._lru:
+            self._versions[session_id] = new_version
+        else:
+            self._forget(session_id)
+
+    async def get(self, session_id: str) -> List[Dict[str, Any]]:
+        cached = self._lru.get(session_id)
+        if self._redis is None:
+            if cached is None:
+                cached = []
+            self._remember(session_id, cached)
+            return cached
+
+        # Another worker may have changed the session; the version tells us
+        # whether the local copy is current without fetching the list.
+        version = int(await self._redis.get(self._version_key(session_id)) or 0)
+        if cached is not None and self._versions.get(session_id) == version:
+            self._lru.move_to_end(session_id)
+            return cached
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lrange(self._key(session_id), 0, -1)
+            pipe.get(self._version_key(session_id))
+            raw, version = await pipe.execute()
+        messages = [orjson.loads(m) for m in raw]
+        self._remember(session_id, messages, int(version or 0))
+        return messages
+
+    async def set(self, session_id: str, messages: List[Dict[str, Any]]) -> None:
+        if self._redis is None:
+            self._remember(session_id, messages)
+            return
+        key, vkey = self._key(session_id), self._version_key(session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if messages:
+                pipe.rpush(key, *(orjson.dumps(m) for m in messages))
+                pipe.expire(key, self.ttl)
+            pipe.incr(vkey)
+            pipe.expire(vkey, self.ttl)
+            results = await pipe.execute()
+        self._remember(session_id, messages, results[-2])
+
+    async def append(self, session_id: str, messages: List[Dict[str, Any]]) -> None:
+        if not messages:
+            return
+        history = await self.get(session_id)
+        if self._redis is None:
+            history.extend(messages)
+            return
+        expected = self._versions.get(session_id, 0)
+        key, vkey = self._key(session_id), self._version_key(session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, *(orjson.dumps(m) for m in messages))
+            pipe.expire(key, self.ttl)
+            pipe.incr(vkey)
+            pipe.expire(vkey, self.ttl)
+            results = await pipe.execute()
+        # Only now that Redis has the turn; a failed write must not diverge the local copy.
+        history.extend(messages)
+        self._track_write(session_id, expected, results[2])
+
+    async def trim(self, session_id: str, max_messages: int) -> None:
+        """Drop the oldest messages so at most `max_messages` remain.
+
+        The cut always lands on a user message, so an assistant tool call is
+        never separated from its tool results.
+        """
+        history = await self.get(session_id)
+        if len(history) <= max_messages:
+            return
+        cut = next((i for i in range(len(history) - max_messages, len(history)) if history[i].get("role") == "user"), None)
+        if cut is None:
+            return
+        if self._redis is None:
+            del history[:cut]
+            return
+
+        # The cut index is only valid against the version we read; skip if it moved.
+        expected = self._versions.get(session_id, 0)
+        key, vkey = self._key(session_id), self._version_key(session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(vkey)
+                if int(await pipe.get(vkey) or 0) != expected:
+                    self._forget(session_id)
+                    return
+                pipe.multi()
+                pipe.ltrim(key, cut, -1)
+                pipe.incr(vkey)
+                results = await pipe.execute()
+            except aioredis.WatchError:
+                self._forget(session_id)
+                return
+        del history[:cut]
+        self._track_write(session_id, expected, results[1])
+
+    async def trim_all(self, max_messages: int) -> None:
+        """Trim every session held in the in-process LRU."""
+        for session_id in list(self._lru):
+            await self.trim(session_id, max_messages)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
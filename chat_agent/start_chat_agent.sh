@@ -3,4 +3,4 @@ source .venv/bin/activate
 pip install --upgrade pip
 pip install -r requirements.txt
 
-uvicorn chat_agent:app --reload --port 8000
\ No newline at end of file
+uvicorn chat_agent:app --reload --port 8000 --log-config log_config.json
\ No newline at end of file
@@ -5,11 +5,11 @@ from fastmcp.resources import TextResource
 import json
 
 # swap these to real implementations later
-from providers import MockInventory, MockMetrics, MockLogs, MockNodeCtl
+from providers import InventoryCache, MockInventory, MockMetrics, MockLogs, MockNodeCtl
 PORT=8001
 mcp = FastMCP("cass-doctor")
 
-inventory = MockInventory()
+inventory = InventoryCache(MockInventory())
 metrics   = MockMetrics()
 logs      = MockLogs()
 ctl       = MockNodeCtl()
@@ -55,12 +55,9 @@ def cluster_overview(customer: str, cluster: str) -> Dict[str, Any]:
     Return a compact overview: topology + a couple of synthetic KPIs.
     """
     topo = inventory.topology(customer, cluster)
-    dc_counts = []
-    total_nodes = 0
-    for dc in topo.get("dcs", []):
-        n = sum(len(r["nodes"]) for r in dc["racks"])
-        total_nodes += n
-        dc_counts.append({"dc": dc["name"], "nodes": n})
+    counts = inventory.node_counts(customer, cluster)
+    dc_counts = [{"dc": dc, "nodes": n} for dc, n in counts]
+    total_nodes = sum(n for _, n in counts)
     kpis = {"replication_ok": True, "recent_alerts": 1, "approx_total_nodes": total_nodes}
     return {"topology": topo, "dc_counts": dc_counts, "kpis": kpis}
 
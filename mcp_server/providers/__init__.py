@@ -1 +1,2 @@
 from .mock import MockInventory, MockMetrics, MockLogs, MockNodeCtl
+from .cache import InventoryCache
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from abc import ABC, abstractmethod
 
 class ClusterInventory(ABC):
@@ -9,6 +9,10 @@ class ClusterInventory(ABC):
     def list_clusters(self, customer: Optional[str] = None) -> List[Dict[str, Any]]: ...
     @abstractmethod
     def topology(self, customer: str, cluster: str) -> Dict[str, Any]: ...
+    def node_counts(self, customer: str, cluster: str) -> List[Tuple[str, int]]:
+        """(dc name, node count) per DC; override when the backend can answer cheaper."""
+        topo = self.topology(customer, cluster)
+        return [(dc["name"], sum(len(r["nodes"]) for r in dc["racks"])) for dc in topo.get("dcs", [])]
 
 class MetricsProvider(ABC):
     @abstractmethod
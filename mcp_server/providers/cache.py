@@ -0,0 +1,61 @@
+from __future__ import annotations
+from typing import List, Dict, Any, Callable, Optional, Tuple
+import time
+from collections import OrderedDict
+from .base import ClusterInventory
+
+def _is_error(value: Any) -> bool:
+    return isinstance(value, dict) and "error" in value
+
+class _TTLMemo:
+    """LRU + TTL memo for one inventory method; error payloads are never stored."""
+    def __init__(self, fn: Callable[..., Any], maxsize: int, ttl: float):
+        self.fn = fn
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Tuple[Any, ...], Tuple[float, Any]]" = OrderedDict()
+
+    def __call__(self, *args: Any) -> Any:
+        entry = self._data.get(args)
+        if entry is not None and entry[0] > time.monotonic():
+            self._data.move_to_end(args)
+            return entry[1]
+        value = self.fn(*args)
+        if _is_error(value):
+            # "not found" or a transient backend failure: ask again next time.
+            self._data.pop(args, None)
+            return value
+        self._data[args] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(args)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+    def cache_clear(self) -> None:
+        self._data.clear()
+
+class InventoryCache(ClusterInventory):
+    """Memoizing wrapper for any ClusterInventory.
+
+    Inventory and topology change rarely, so real backends (CMDB, cloud APIs)
+    can be wrapped once at startup instead of hitting the backend per tool call.
+    Entries expire after `ttl` seconds and error results are not cached; call
+    `clear()` after a known topology change.
+    """
+    def __init__(self, inner: ClusterInventory, maxsize: int = 256, ttl: float = 300.0):
+        self.inner = inner
+        self._list_customers = _TTLMemo(inner.list_customers, 1, ttl)
+        self._list_clusters = _TTLMemo(inner.list_clusters, maxsize, ttl)
+        self._topology = _TTLMemo(inner.topology, maxsize, ttl)
+
+    def list_customers(self) -> List[str]:
+        return self._list_customers()
+    def list_clusters(self, customer: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._list_clusters(customer)
+    def topology(self, customer: str, cluster: str) -> Dict[str, Any]:
+        return self._topology(customer, cluster)
+    # node_counts is inherited: it sums the cached topology, so each key reaches the backend once.
+
+    def clear(self) -> None:
+        for fn in (self._list_customers, self._list_clusters, self._topology):
+            fn.cache_clear()
@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from .base import ClusterInventory, MetricsProvider, LogsProvider, NodeController
-import random, time
+import random, re, time
+import numpy as np
 
 CUSTOMERS = ["Contoso", "Fabrikam"]
 CLUSTERS = {
@@ -31,6 +32,12 @@ TOPO = {
     }
 }
 
+# (dc name, node count) per DC, derived once from the static TOPO above
+NODE_COUNTS = {
+    key: [(dc["name"], sum(len(r["nodes"]) for r in dc["racks"])) for dc in topo["dcs"]]
+    for key, topo in TOPO.items()
+}
+
 class MockInventory(ClusterInventory):
     def list_customers(self) -> List[str]:
         return CUSTOMERS
@@ -44,12 +51,18 @@ class MockInventory(ClusterInventory):
         return out
     def topology(self, customer: str, cluster: str) -> Dict[str, Any]:
         return TOPO.get((customer, cluster), {"error":"not found"})
+    def node_counts(self, customer: str, cluster: str) -> List[Tuple[str, int]]:
+        return NODE_COUNTS.get((customer, cluster), [])
 
 class MockMetrics(MetricsProvider):
     def query(self, customer: str, cluster: str, metric: str, window: str = "15m") -> Dict[str, Any]:
+        n = 15
         now = int(time.time())
-        series = [{"t": now - i*60, "v": round(random.uniform(1,20),2)} for i in range(15)]
-        return {"customer":customer,"cluster":cluster,"metric":metric,"window":window,"series":list(reversed(series))}
+        # oldest first: timestamps one minute apart ending at `now`
+        ts = now - np.arange(n - 1, -1, -1) * 60
+        vs = np.round(np.random.uniform(1, 20, n), 2)
+        series = [{"t": t, "v": v} for t, v in zip(ts.tolist(), vs.tolist())]
+        return {"customer":customer,"cluster":cluster,"metric":metric,"window":window,"series":series}
     def node_health(self, customer: str, cluster: str, node: str) -> Dict[str, Any]:
         return {
             "customer":customer,"cluster":cluster,"node":node,
@@ -63,11 +76,11 @@ class MockMetrics(MetricsProvider):
 class MockLogs(LogsProvider):
     def fetch(self, customer: str, cluster: str, node: Optional[str], pattern: Optional[str],
               since: str = "15m", limit: int = 200) -> Dict[str, Any]:
-        lines = []
-        for i in range(min(limit, 10)):
-            lines.append(f"{time.strftime('%Y-%m-%dT%H:%M:%S')} [{node or '10.0.0.10'}] INFO CompactionTask - Completed SSTable compaction.")
+        line = f"{time.strftime('%Y-%m-%dT%H:%M:%S')} [{node or '10.0.0.10'}] INFO CompactionTask - Completed SSTable compaction."
+        lines = [line] * min(limit, 10)
         if pattern:
-            lines = [ln for ln in lines if pattern.lower() in ln.lower()]
+            rx = re.compile(re.escape(pattern), re.IGNORECASE)
+            lines = [ln for ln in lines if rx.search(ln)]
         return {"customer":customer,"cluster":cluster,"node":node,"since":since,"count":len(lines),"lines":lines}
 
 class MockNodeCtl(NodeController):
@@ -77,8 +90,8 @@ class MockNodeCtl(NodeController):
         return {"customer":customer,"cluster":cluster,"node":node,"action":"restart","status":"SIMULATED_OK"}
     def advise_capacity(self, customer: str, cluster: str) -> Dict[str, Any]:
         # naive mock: if avg p99 > 25ms or disk > 80% → suggest +2 nodes
-        topo = TOPO.get((customer, cluster))
-        node_count = sum(len(r["nodes"]) for dc in topo["dcs"] for r in dc["racks"]) if topo else 3
+        counts = NODE_COUNTS.get((customer, cluster))
+        node_count = sum(n for _, n in counts) if counts else 3
         advice = {
             "current_nodes": node_count,
             "suggested_nodes": node_count + 2,